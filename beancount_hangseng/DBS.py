@@ -6,7 +6,6 @@ __copyright__ = "Copyright (C) 2019 Cheong Yiu Fung"
 __license__ = "GNU GPLv3"
 
 import struct
-import re
 from beancount.ingest import importer
 from beancount.core.amount import Amount
 from beancount.core import data
@@ -14,7 +13,7 @@ from beancount.core import flags
 from beancount.core.number import D
 from datetime import datetime
 
-from beancount_hangseng import utils
+from beancount_hangseng import patterns, utils
 
 
 class DBSImporter(importer.ImporterProtocol):
@@ -32,23 +31,19 @@ class DBSImporter(importer.ImporterProtocol):
             return False
         text = f.convert(utils.pdf_to_text)
         if text:
-            return re.search('www.dbs.com', text) is not None
+            return patterns.identify('dbs', text)
 
     def extract(self, f, existing_entries=None):
         text = f.convert(utils.pdf_to_text)
-        # We only care about everything before GRAND TOTAL. There are some
-        # transactions after that, but those are for next month.
-        allmatches = re.findall("(?P<corpus>(.|\n)*?GRAND TOTAL)", text)
-        text = '\n'.join(match[0] for match in allmatches)
-        # print(text)
+        layout = patterns.select('dbs', text)
+        # We only care about everything before the last GRAND TOTAL. There
+        # are some transactions after that, but those are for next month.
+        match = layout.patterns['corpus'].search(text)
+        text = match.group('corpus') if match else ''
         # Each section of account begins with "TRANS DATE POST DATE" Row.
-        # Extract everything non-greedily (*?) until there's a page break (Which
-        # shows "SUMMARY OF ACTIVITY SINCE YOUR LAST STATEMENT", or "*****
-        # FINANCE CHARGE RATES *****"
-        SAVINGS_REGEXP = "([a-zA-Z] [0-9]{4}-[0-9]{4}-[0-9]{4}-[0-9]{4}|TRANS DATE *POST DATE).*(?P<record>(.|\n)*?)((?=GRAND TOTAL)|(?=[0-9]{5,}/[0-9]{5,}))"
-        allmatches = re.findall(SAVINGS_REGEXP, text)
-        # For each match result, the 1st group is start marker, while the 3rd group is end markers, which we don't need.
-        record_corpus = '\n'.join(match[1] for match in allmatches)
+        # Extract everything non-greedily (*?) until GRAND TOTAL or a page
+        # number.
+        record_corpus = '\n'.join(match.group('record') for match in layout.patterns['records'].finditer(text))
         return self.get_txns_from_text(record_corpus, f)
 
     def file_name(self, f):
@@ -57,15 +52,13 @@ class DBSImporter(importer.ImporterProtocol):
     def file_account(self, f):
         # Get account from eStatement
         text = f.convert(utils.pdf_to_text)
-        match = re.search('ACCOUNT NUMBER\s+([0-9]{4}-[0-9]{4}-[0-9]{4}-[0-9]{4})', text)
+        match = patterns.select('dbs', text).patterns['account'].search(text)
         if match:
             return match.group(1).replace(' ', '-')
 
     def file_date(self, f):
         text = f.convert(utils.pdf_to_text)
-        match = re.search('STATEMENT DATE.*?([0-9]{2} (?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC) [0-9]{4})', text)
-        if match:
-            return datetime.strptime(match.group(1), "%d %b %Y").date()
+        return patterns.find_statement_date(patterns.select('dbs', text), text)
 
     def get_txns_from_text(self, corpus, f):
         """
@@ -6,7 +6,6 @@ __copyright__ = "Copyright (C) 2019 Cheong Yiu Fung"
 __license__ = "GNU GPLv3"
 
 import struct
-import re
 from beancount.ingest import importer
 from beancount.core.amount import Amount
 from beancount.core import data
@@ -14,7 +13,7 @@ from beancount.core import flags
 from beancount.core.number import D
 from datetime import datetime
 
-from beancount_hangseng import utils
+from beancount_hangseng import patterns, utils
 
 
 class MPowerMasterImporter(importer.ImporterProtocol):
@@ -32,7 +31,7 @@ class MPowerMasterImporter(importer.ImporterProtocol):
             return False
         text = f.convert(utils.pdf_to_text)
         if text:
-            return re.search('MPOWER', text) is not None
+            return patterns.identify('mpower', text)
 
     def extract(self, f, existing_entries=None):
         text = f.convert(utils.pdf_to_text)
@@ -40,10 +39,8 @@ class MPowerMasterImporter(importer.ImporterProtocol):
         # Extract everything non-greedily (*?) until there's a page break (Which
         # shows "SUMMARY OF ACTIVITY SINCE YOUR LAST STATEMENT", or "*****
         # FINANCE CHARGE RATES *****"
-        SAVINGS_REGEXP = "TRANS DATE +POST DATE.*\n.*(?P<record>(.|\n)*?)(?=SUMMARY|\*\*\*\*\* FINANCE)"
-        allmatches = re.findall(SAVINGS_REGEXP, text)
-        # For each match result, the 2nd group is end markers, which we don't need.
-        record_corpus = '\n'.join(match[0] for match in allmatches)
+        layout = patterns.select('mpower', text)
+        record_corpus = '\n'.join(match.group('record') for match in layout.patterns['records'].finditer(text))
         return self.get_txns_from_text(record_corpus, f)
 
     def file_name(self, f):
@@ -54,7 +51,7 @@ class MPowerMasterImporter(importer.ImporterProtocol):
         text = f.convert(utils.pdf_to_text)
         # Actual account number is first 16 digit in the next line where
         # "ACCOUNT NO" appears.
-        match = re.search('ACCOUNT NO.*\n\s*([0-9]{4} [0-9]{4} [0-9]{4} [0-9]{4})', text)
+        match = patterns.select('mpower', text).patterns['account'].search(text)
         if match:
             return match.group(1).replace(' ', '-')
 
@@ -62,9 +59,7 @@ class MPowerMasterImporter(importer.ImporterProtocol):
         # Get statement date from eStatement.
         # Use Closing Date
         text = f.convert(utils.pdf_to_text)
-        match = re.search('CLOSING DATE.*\n.*?([0-9]{2} (?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC) [0-9]{4})', text)
-        if match:
-            return datetime.strptime(match.group(1), "%d %b %Y").date()
+        return patterns.find_statement_date(patterns.select('mpower', text), text)
 
     def get_txns_from_text(self, corpus, f):
         """
@@ -83,11 +78,12 @@ Sample output of the corpus:
         1) New transaction starts at lines with a new transaction date
         2) Amount is at the same line of new transaction
         """
+        account = self.file_account(f)
         def is_useful_lines(line):
             # Skip useless lines. It's either the OPENING BALANCE, or the line
             # that indicates beginning of transactions, which starts with
             # account number
-            return (not line.strip().startswith("OPENING BALANCE")) and (not '-'.join(line.split()).startswith(self.file_account(f)))
+            return (not line.strip().startswith("OPENING BALANCE")) and (not '-'.join(line.split()).startswith(account))
         lines = corpus.split('\n')
         lines = list(filter(is_useful_lines, lines))
 
@@ -99,7 +95,7 @@ Sample output of the corpus:
         if self.debug:
             print('\n'.join(lines))
             print("padwidth: {}".format(self.pad_width))
-            print("Account: {}".format(self.file_account(f)))
+            print("Account: {}".format(account))
         # Prepare variables
         entries = []
         narration = ''  # Initialize narration
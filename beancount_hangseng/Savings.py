@@ -6,7 +6,6 @@ __copyright__ = "Copyright (C) 2019 Cheong Yiu Fung"
 __license__ = "GNU GPLv3"
 
 import struct
-import re
 from beancount.ingest import importer
 from beancount.core.amount import Amount
 from beancount.core import data
@@ -14,7 +13,7 @@ from beancount.core import flags
 from beancount.core.number import D
 from datetime import datetime
 
-from beancount_hangseng import utils
+from beancount_hangseng import patterns, utils
 
 
 class HangSengSavingsImporter(importer.ImporterProtocol):
@@ -34,18 +33,15 @@ class HangSengSavingsImporter(importer.ImporterProtocol):
         # identify instead, which is 024.
         text = f.convert(utils.pdf_to_text)
         if text:
-            return re.search('Bank code +024', text) is not None
+            return patterns.identify('hangseng', text)
 
     def extract(self, f, existing_entries=None):
         text = f.convert(utils.pdf_to_text)
         # Each section of account begins with "Integrated Account Statement
         # Savings". Extract everything non-greedily (*?) until there's a page
         # break (\n\n\n), or when it ends with the row of "Transaction Summary"
-        SAVINGS_REGEXP = "Integrated Account Statement Savings\n.*\n.*\n\n(?P<record>(.|\n)*?)(?=\n\n|Transaction Summary|Credit Interest Accrued)"
-        allmatches = re.findall(SAVINGS_REGEXP, text)
-        # For each match result, the 2nd group is the ending page break or
-        # 'Transaction Summary', which we don't need.
-        record_corpus = '\n'.join(match[0] for match in allmatches)
+        layout = patterns.select('hangseng', text)
+        record_corpus = '\n'.join(match.group('record') for match in layout.patterns['records'].finditer(text))
         return self.get_txns_from_text(record_corpus, f)
 
     def file_name(self, f):
@@ -54,16 +50,14 @@ class HangSengSavingsImporter(importer.ImporterProtocol):
     def file_account(self, f):
         # Get account from eStatement
         text = f.convert(utils.pdf_to_text)
-        match = re.search('Account Number +(.*)', text)
+        match = patterns.select('hangseng', text).patterns['account'].search(text)
         if match:
             return match.group(1)
 
     def file_date(self, f):
         # Get statement date from eStatement
         text = f.convert(utils.pdf_to_text)
-        match = re.search('Statement Date +(.*)', text)
-        if match:
-            return datetime.strptime(match.group(1), "%d %b %Y").date()
+        return patterns.find_statement_date(patterns.select('hangseng', text), text)
 
     def get_txns_from_text(self, corpus, f):
         statement_date = self.file_date(f)
@@ -0,0 +1,172 @@
+"""Versioned regular expressions used to parse bank eStatements.
+
+Banks change the layout of their statements from time to time, and an old
+statement needs the patterns that were valid when it was issued. Each bank has
+a list of layouts, newest first. A layout carries every pattern an importer
+needs, compiled once at import time so that repeated calls do not depend on
+the small module-level cache of `re`.
+
+A layout is chosen by its fingerprint (a pattern only found in statements of
+that layout) when one matches, otherwise by the statement date, otherwise the
+newest layout is used. The statement date is found with the `date` pattern of
+each layout in turn, newest first, so `date` patterns must not overlap between
+layouts: a new layout whose `date` pattern also matches old statements would
+be picked for them.
+
+Lazy patterns (`*?`) scan to the end of the text when their end marker is
+missing. Keep such scans to one per statement (anchor them, or bound them by a
+marker that always follows), so that parse time stays linear.
+"""
+__copyright__ = "Copyright (C) 2019 Cheong Yiu Fung"
+__license__ = "GNU GPLv3"
+
+import re
+from collections import namedtuple
+from datetime import date, datetime
+
+MONTHS = "(?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)"
+
+# name: A string, a human readable name of the layout.
+# since: A datetime.date, the first statement date using this layout.
+# fingerprint: A compiled pattern identifying this layout, or None.
+# patterns: A dict of pattern name to compiled pattern.
+Layout = namedtuple('Layout', 'name since fingerprint patterns')
+
+
+def layout(name, since, patterns, fingerprint=None):
+    """Build a Layout, compiling the fingerprint and all patterns.
+
+    Args:
+      name: A string, name of the layout.
+      since: A datetime.date, the first statement date using this layout.
+      patterns: A dict of pattern name to pattern string.
+      fingerprint: An optional pattern string identifying this layout.
+    Returns:
+      A Layout instance.
+    """
+    return Layout(name,
+                  since,
+                  re.compile(fingerprint) if fingerprint else None,
+                  {key: re.compile(value) for key, value in patterns.items()})
+
+
+# Layouts of each bank, newest first.
+LAYOUTS = {
+    'hangseng': [
+        layout('2016', date(2016, 1, 1), {
+            'identify': r'Bank code +024',
+            # Each section of account begins with "Integrated Account
+            # Statement Savings". Extract everything non-greedily until
+            # there's a page break (\n\n), or when it ends with the row of
+            # "Transaction Summary".
+            'records': r'Integrated Account Statement Savings\n.*\n.*\n\n(?P<record>[\s\S]*?)(?=\n\n|Transaction Summary|Credit Interest Accrued)',
+            'account': r'Account Number +(.*)',
+            'date': r'Statement Date +(.*)',
+        }),
+    ],
+    'mpower': [
+        layout('2016', date(2016, 1, 1), {
+            'identify': r'MPOWER',
+            # Each section of account begins with "TRANS DATE POST DATE" Row.
+            # Extract everything non-greedily until there's a page break
+            # (Which shows "SUMMARY OF ACTIVITY SINCE YOUR LAST STATEMENT",
+            # or "***** FINANCE CHARGE RATES *****")
+            'records': r'TRANS DATE +POST DATE.*\n.*(?P<record>[\s\S]*?)(?=SUMMARY|\*\*\*\*\* FINANCE)',
+            # Actual account number is first 16 digit in the next line where
+            # "ACCOUNT NO" appears.
+            'account': r'ACCOUNT NO.*\n\s*([0-9]{4} [0-9]{4} [0-9]{4} [0-9]{4})',
+            'date': r'CLOSING DATE.*\n.*?([0-9]{2} ' + MONTHS + r' [0-9]{4})',
+        }),
+    ],
+    'dbs': [
+        layout('2019', date(2019, 1, 1), {
+            'identify': r'www\.dbs\.com',
+            # We only care about everything before the last GRAND TOTAL.
+            # There are some transactions after that, but those are for next
+            # month. Anchored and greedy, so it is a single linear pass.
+            'corpus': r'\A(?P<corpus>[\s\S]*GRAND TOTAL)',
+            # Each section begins with the card number or "TRANS DATE POST
+            # DATE" row, and ends at GRAND TOTAL or the page number.
+            'records': r'(?:[a-zA-Z] [0-9]{4}-[0-9]{4}-[0-9]{4}-[0-9]{4}|TRANS DATE *POST DATE).*(?P<record>[\s\S]*?)(?:(?=GRAND TOTAL)|(?=[0-9]{5,}/[0-9]{5,}))',
+            'account': r'ACCOUNT NUMBER\s+([0-9]{4}-[0-9]{4}-[0-9]{4}-[0-9]{4})',
+            'date': r'STATEMENT DATE.*?([0-9]{2} ' + MONTHS + r' [0-9]{4})',
+        }),
+    ],
+}
+
+
+def select(bank, text=None, statement_date=None):
+    """Select the layout of a bank that applies to a statement.
+
+    The fingerprint of each layout is tried first. Otherwise the layout is
+    chosen by the statement date, which is found from the text if not given.
+    A statement older than every layout gets the oldest layout, and one with
+    no known date gets the newest layout.
+
+    Args:
+      bank: A string, key of the bank in LAYOUTS.
+      text: An optional string, the text of the statement.
+      statement_date: An optional datetime.date, the statement date.
+    Returns:
+      A Layout instance.
+    """
+    layouts = LAYOUTS[bank]
+    if text:
+        for candidate in layouts:
+            if candidate.fingerprint and candidate.fingerprint.search(text):
+                return candidate
+        if statement_date is None:
+            statement_date = _guess_statement_date(layouts, text)
+    if statement_date:
+        for candidate in layouts:
+            if candidate.since <= statement_date:
+                return candidate
+        return layouts[-1]
+    return layouts[0]
+
+
+def _guess_statement_date(layouts, text):
+    """Find the statement date with the first layout whose date pattern parses.
+
+    Args:
+      layouts: A list of Layout instances, newest first.
+      text: A string, the text of the statement.
+    Returns:
+      A datetime.date, or None if no date is found.
+    """
+    for candidate in layouts:
+        try:
+            statement_date = find_statement_date(candidate, text)
+        except ValueError:
+            continue
+        if statement_date:
+            return statement_date
+
+
+def identify(bank, text):
+    """Return true if the text matches any known layout of a bank.
+
+    Args:
+      bank: A string, key of the bank in LAYOUTS.
+      text: A string, the text of the statement.
+    Returns:
+      A boolean.
+    """
+    return any(candidate.patterns['identify'].search(text) is not None
+               for candidate in LAYOUTS[bank])
+
+
+def find_statement_date(layout, text):
+    """Find the statement date of a statement.
+
+    Args:
+      layout: A Layout instance, the layout of the statement.
+      text: A string, the text of the statement.
+    Returns:
+      A datetime.date, or None if no date is found.
+    Raises:
+      ValueError: If the date found is not in the expected format.
+    """
+    match = layout.patterns['date'].search(text)
+    if match:
+        return datetime.strptime(match.group(1), "%d %b %Y").date()
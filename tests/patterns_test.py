@@ -0,0 +1,129 @@
+"""Unit tests for the versioned statement patterns (using pytest)."""
+__copyright__ = "Copyright (C) 2019 Cheong Yiu Fung"
+__license__ = "GNU GPLv3"
+
+from datetime import date
+import timeit
+import pytest
+
+from beancount_hangseng import patterns
+
+# A minimal page of each bank, enough for every pattern of a layout to match.
+PAGES = {
+    'hangseng': (
+        "Bank code 024\n"
+        "Account Number 123-456789-001\n"
+        "Statement Date 05 Jan 2019\n"
+        "Integrated Account Statement Savings\n"
+        "Date       Transaction Details\n"
+        "HKD\n"
+        "\n"
+        "05 Dec     CREDIT INTEREST                     1.00\n"
+        "           ATM WITHDRAWAL                                 100.00\n"
+        "\n"
+        "Transaction Summary\n"
+    ),
+    'mpower': (
+        "MPOWER\n"
+        "ACCOUNT NO\n"
+        "   5408 0620 1234 5678\n"
+        "CLOSING DATE\n"
+        "   02 JUN 2016\n"
+        "TRANS DATE      POST DATE         DESCRIPTION\n"
+        "\n"
+        "18 MAY 2016      19 MAY 2016       OCTOPUS CARDS LTD       250.00\n"
+        "SUMMARY OF ACTIVITY SINCE YOUR LAST STATEMENT\n"
+    ),
+    'dbs': (
+        "www.dbs.com\n"
+        "ACCOUNT NUMBER 4518-3545-1234-5678\n"
+        "STATEMENT DATE 05 OCT 2019\n"
+        "TRANS DATE POST DATE DESCRIPTION\n"
+        " 22   SEP            23   SEP            7-ELEVEN, HK    13.50\n"
+        "GRAND TOTAL\n"
+    ),
+}
+
+# The line that opens a record section of each bank, without its end marker.
+RECORD_STARTS = {
+    'hangseng': "Integrated Account Statement Savings\nDate\nHKD\n\n",
+    'mpower': "TRANS DATE      POST DATE         DESCRIPTION\n\n",
+    'dbs': "TRANS DATE POST DATE DESCRIPTION\n",
+}
+
+# A transaction line that is not followed by any end marker, such as the
+# transactions for next month after GRAND TOTAL on a DBS statement.
+TAIL_LINE = " 24   SEP            25   SEP            THE H.K. MI-HOME    219.00\n"
+
+
+@pytest.mark.parametrize('bank', sorted(patterns.LAYOUTS))
+def test_identify(bank):
+    assert patterns.identify(bank, PAGES[bank])
+    for other in PAGES:
+        if other != bank:
+            assert not patterns.identify(bank, PAGES[other])
+
+
+def test_find_statement_date():
+    def find(bank, text):
+        return patterns.find_statement_date(patterns.select(bank, text), text)
+    assert find('hangseng', PAGES['hangseng']) == date(2019, 1, 5)
+    assert find('mpower', PAGES['mpower']) == date(2016, 6, 2)
+    assert find('dbs', PAGES['dbs']) == date(2019, 10, 5)
+    assert find('dbs', PAGES['mpower']) is None
+    with pytest.raises(ValueError):
+        find('hangseng', "Statement Date 05 Jan 2019 Page 1\n")
+
+
+def test_select(monkeypatch):
+    old = patterns.layout('old', date(2010, 1, 1), {}, fingerprint='OLD LAYOUT')
+    new = patterns.layout('new', date(2018, 1, 1), {})
+    monkeypatch.setitem(patterns.LAYOUTS, 'bank', [new, old])
+    # Newest layout when no date is known
+    assert patterns.select('bank') is new
+    # By statement date, oldest layout for statements older than all layouts
+    assert patterns.select('bank', statement_date=date(2019, 1, 1)) is new
+    assert patterns.select('bank', statement_date=date(2017, 1, 1)) is old
+    assert patterns.select('bank', statement_date=date(2000, 1, 1)) is old
+    # Fingerprint wins over statement date
+    assert patterns.select('bank', 'OLD LAYOUT', date(2019, 1, 1)) is old
+
+
+def test_select_ignores_unparsable_date():
+    text = "Account Number 123-456789-001\nStatement Date 05 Jan 2019 Page 1\n"
+    layout = patterns.select('hangseng', text)
+    assert layout.patterns['account'].search(text).group(1) == "123-456789-001"
+
+
+def parse_time(layout, text):
+    """Return the best time of running every pattern of a layout over text."""
+    def run():
+        for pattern in layout.patterns.values():
+            for _ in pattern.finditer(text):
+                pass
+    return min(timeit.repeat(run, number=1, repeat=5))
+
+
+LAYOUTS = [(bank, layout)
+           for bank, layouts in sorted(patterns.LAYOUTS.items())
+           for layout in layouts]
+
+
+# Each input is built from n repetitions: whole pages, pages followed by an
+# unterminated tail, and a record section whose end marker never comes.
+INPUTS = {
+    'pages': lambda bank, n: PAGES[bank] * n,
+    'unterminated tail': lambda bank, n: PAGES[bank] + TAIL_LINE * n,
+    'unterminated record': lambda bank, n: PAGES[bank] + RECORD_STARTS[bank] + TAIL_LINE * n,
+}
+
+
+@pytest.mark.parametrize('shape', sorted(INPUTS))
+@pytest.mark.parametrize('bank,layout', LAYOUTS)
+def test_parse_time_is_linear(bank, layout, shape):
+    # A statement N times longer should take roughly N times longer to parse.
+    # Allow a generous margin for timer noise, but catch quadratic patterns.
+    small, large = 100, 800
+    small_time = parse_time(layout, INPUTS[shape](bank, small))
+    large_time = parse_time(layout, INPUTS[shape](bank, large))
+    assert large_time < small_time * (large / small) * 3